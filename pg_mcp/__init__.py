@@ -1,135 +1,146 @@
 #!/usr/bin/env python3
 
-import os
-import json
 import asyncio
-import locale
-from typing import List
+from contextlib import asynccontextmanager
+from typing import List, Optional, Union
 from fastmcp import FastMCP
-from .pg_handler import PostgreSQLHandler
+from ._locale import IS_CHINESE
+from .pg_handler import PostgreSQLHandler, _dumps
 
-# 检测语言环境
-def _detect_chinese_locale() -> bool:
-    """检测是否为中文语言环境"""
-    try:
-        # 尝试获取系统语言环境
-        lang = locale.getdefaultlocale()[0]
-        if lang and ('zh' in lang.lower() or 'chinese' in lang.lower()):
-            return True
-        
-        # 检查环境变量
-        for env_var in ['LANG', 'LANGUAGE', 'LC_ALL', 'LC_MESSAGES']:
-            lang_env = os.getenv(env_var, '')
-            if lang_env and ('zh' in lang_env.lower() or 'chinese' in lang_env.lower()):
-                return True
-        
-        return False
-    except Exception:
-        return False
+# 消息模板表:(中文, 英文)。只格式化被选中语言的模板
+_MSGS = {
+    'databases_found': (
+        "找到 {n} 个数据库",
+        "Found {n} database(s)",
+    ),
+    'databases_failed': (
+        "获取数据库列表失败: {error}",
+        "Failed to get database list: {error}",
+    ),
+    'tables_found': (
+        "找到 {n} 个表",
+        "Found {n} table(s)",
+    ),
+    'tables_failed': (
+        "获取表列表失败: {error}",
+        "Failed to get table list: {error}",
+    ),
+    'describe_failed': (
+        "描述表 '{table}' 失败: {error}",
+        "Failed to describe table '{table}': {error}",
+    ),
+    'query_failed': (
+        "执行查询失败: {error}",
+        "Failed to execute query: {error}",
+    ),
+}
+
+def _msg(key: str, **kwargs) -> str:
+    """按key取当前语言的消息模板并格式化"""
+    template = _MSGS[key][0 if IS_CHINESE else 1]
+    return template.format(**kwargs) if kwargs else template
 
-def _get_message(zh_msg: str, en_msg: str) -> str:
-    """根据语言环境返回对应消息"""
-    return zh_msg if _detect_chinese_locale() else en_msg
+@asynccontextmanager
+async def _lifespan(app):
+    """服务器生命周期管理,关闭时释放连接池"""
+    try:
+        yield
+    finally:
+        await PostgreSQLHandler.close_pool()
 
 # 创建FastMCP应用
-mcp = FastMCP("PostgreSQL Database Server")
+mcp = FastMCP("PostgreSQL Database Server", lifespan=_lifespan)
+
+# 进程级共享的处理器实例:处理器不持有每请求的可变状态,构造一次即可,
+# 避免每次工具调用都重新读取环境变量、解析PG_HOST。
+# 惰性创建,保证缺少环境变量时包本身仍可导入
+_handler: Optional[PostgreSQLHandler] = None
+
+def _get_handler() -> PostgreSQLHandler:
+    """获取共享的PostgreSQLHandler实例"""
+    global _handler
+    if _handler is None:
+        _handler = PostgreSQLHandler()
+    return _handler
 
 @mcp.tool()
-async def list_databases() -> str:
+async def list_databases() -> bytes:
     """列出PostgreSQL实例中的所有数据库"""
-    handler = PostgreSQLHandler()
+    handler = _get_handler()
     try:
         databases = await handler.list_databases()
-        message = _get_message(
-            f"找到 {len(databases)} 个数据库",
-            f"Found {len(databases)} database(s)"
-        )
+        message = _msg('databases_found', n=len(databases))
         result = {
             "status": "success",
             "message": message,
             "databases": databases
         }
-        return json.dumps(result, ensure_ascii=False)
+        return _dumps(result)
     except Exception as e:
-        message = _get_message(
-            f"获取数据库列表失败: {str(e)}",
-            f"Failed to get database list: {str(e)}"
-        )
+        message = _msg('databases_failed', error=str(e))
         error_result = {
             "status": "error", 
             "message": message
         }
-        return json.dumps(error_result, ensure_ascii=False)
+        return _dumps(error_result)
 
 @mcp.tool()
-async def list_tables() -> str:
+async def list_tables() -> bytes:
     """列出当前数据库中的所有表"""
-    handler = PostgreSQLHandler()
+    handler = _get_handler()
     try:
         tables = await handler.list_tables()
-        message = _get_message(
-            f"找到 {len(tables)} 个表",
-            f"Found {len(tables)} table(s)"
-        )
+        message = _msg('tables_found', n=len(tables))
         result = {
             "status": "success",
             "message": message,
             "tables": tables
         }
-        return json.dumps(result, ensure_ascii=False)
+        return _dumps(result)
     except Exception as e:
-        message = _get_message(
-            f"获取表列表失败: {str(e)}",
-            f"Failed to get table list: {str(e)}"
-        )
+        message = _msg('tables_failed', error=str(e))
         error_result = {
             "status": "error",
             "message": message
         }
-        return json.dumps(error_result, ensure_ascii=False)
+        return _dumps(error_result)
 
 @mcp.tool()
-async def describe_table(table_name: str) -> str:
+async def describe_table(table_name: str) -> bytes:
     """描述指定表的结构信息
     
     Args:
         table_name: 要描述的表名
     """
-    handler = PostgreSQLHandler()
+    handler = _get_handler()
     try:
         result = await handler.describe_table(table_name)
         return result
     except Exception as e:
-        message = _get_message(
-            f"描述表 '{table_name}' 失败: {str(e)}",
-            f"Failed to describe table '{table_name}': {str(e)}"
-        )
+        message = _msg('describe_failed', table=table_name, error=str(e))
         error_result = {
             "status": "error",
             "message": message
         }
-        return json.dumps(error_result, ensure_ascii=False)
+        return _dumps(error_result)
 
 @mcp.tool()
-async def execute_query(query: str) -> str:
+async def execute_query(query: str) -> Union[str, bytes]:
     """执行SQL查询（默认仅支持SELECT查询，可通过环境变量启用更多操作）
     
     Args:
         query: 要执行的SQL查询语句
     """
-    handler = PostgreSQLHandler()
+    handler = _get_handler()
     try:
         result = await handler.execute_query(query)
         return result
     except Exception as e:
-        message = _get_message(
-            f"执行查询失败: {str(e)}",
-            f"Failed to execute query: {str(e)}"
-        )
+        message = _msg('query_failed', error=str(e))
         error_result = {
             "status": "error",
             "message": message
         }
-        return json.dumps(error_result, ensure_ascii=False)
+        return _dumps(error_result)
 
 # FastMCP服务器已配置，可通过mcp.run()启动
\ No newline at end of file
@@ -7,8 +7,15 @@ import os
 def main():
     """主入口函数"""
     try:
+        # 优先使用uvloop事件循环,asyncpg在libuv上的socket I/O开销明显更低
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
         print("Starting PostgreSQL FastMCP Server...", file=sys.stderr)
-        
+
         # 导入并运行FastMCP应用
         from . import mcp
         mcp.run()
@@ -0,0 +1,36 @@
+"""语言环境检测,包内共享
+
+语言环境在进程生命周期内不会变化,导入本模块时检测一次,
+各模块直接复用IS_CHINESE常量。
+"""
+
+import os
+import locale
+
+
+def _detect() -> bool:
+    """检测是否为中文语言环境"""
+    try:
+        # 尝试获取系统语言环境
+        lang = locale.getdefaultlocale()[0]
+        if lang and ('zh' in lang.lower() or 'chinese' in lang.lower()):
+            return True
+
+        # 检查环境变量
+        for env_var in ['LANG', 'LANGUAGE', 'LC_ALL', 'LC_MESSAGES']:
+            lang_env = os.getenv(env_var, '')
+            if lang_env and ('zh' in lang_env.lower() or 'chinese' in lang_env.lower()):
+                return True
+
+        return False
+    except Exception:
+        # 如果检测失败,默认使用英文
+        return False
+
+
+IS_CHINESE = _detect()
+
+
+def msg(zh_msg: str, en_msg: str) -> str:
+    """根据语言环境返回对应消息"""
+    return zh_msg if IS_CHINESE else en_msg
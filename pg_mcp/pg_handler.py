@@ -2,30 +2,331 @@ import os
 import re
 import asyncio
 import asyncpg
-import json
+import orjson
 import sqlparse
-import locale
 from decimal import Decimal
+from functools import lru_cache
 from sqlparse import sql, tokens as T
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import logging
 
+from ._locale import IS_CHINESE, msg as _locale_msg
+
+_log = logging.getLogger(__name__)
+
+
+# 消息模板表:(中文, 英文)。通过_msg按key取用,只格式化被选中语言的
+# 模板,避免每条消息都构建一份随即丢弃的另一语言f-string
+_MSGS = {
+    'disallowed_command': (
+        "不允许的SQL命令: {keyword}。仅允许SELECT、SHOW、DESCRIBE、EXPLAIN查询,除非在环境变量中启用危险操作。",
+        "Disallowed SQL command: {keyword}. Only SELECT, SHOW, DESCRIBE, EXPLAIN queries are allowed unless dangerous operations are enabled via environment variable.",
+    ),
+    'dangerous_construct': (
+        "检测到危险的{description}操作,查询被拒绝",
+        "Detected dangerous {description} operation, query rejected",
+    ),
+    'union_detected': (
+        "检测到UNION操作,可能存在安全风险,查询被拒绝",
+        "Detected UNION operation, potential security risk, query rejected",
+    ),
+    'nested_dml': (
+        "在SELECT语句中检测到危险的{keyword}操作",
+        "Detected dangerous {keyword} operation in SELECT statement",
+    ),
+    'table_missing': (
+        "表 '{table}' 不存在或无权限访问",
+        "Table '{table}' does not exist or access denied",
+    ),
+    'table_described': (
+        "表 '{table}' 包含 {n} 个字段",
+        "Table '{table}' contains {n} field(s)",
+    ),
+    'query_rejected': (
+        "查询被拒绝",
+        "Query rejected",
+    ),
+    'query_no_results': (
+        "查询执行成功,但没有返回结果",
+        "Query executed successfully, but no results returned",
+    ),
+    'query_ok': (
+        "查询执行成功,返回 {n} 行结果",
+        "Query executed successfully, returned {n} row(s)",
+    ),
+}
+
+
+def _msg(key: str, **kwargs) -> str:
+    """按key取当前语言的消息模板并格式化"""
+    template = _MSGS[key][0 if IS_CHINESE else 1]
+    return template.format(**kwargs) if kwargs else template
+
+
+def _default(obj):
+    """orjson的兜底序列化回调,处理Decimal类型"""
+    if isinstance(obj, Decimal):
+        # 将Decimal转换为float,如果需要保持精度可以转为string
+        return float(obj)
+    raise TypeError
+
+
+def _dumps(obj) -> bytes:
+    """使用orjson序列化为UTF-8字节串
+
+    fastmcp>=3.3.0(见pyproject.toml)把bytes工具返回值按文本透传,
+    直接返回orjson的输出可省去一次全量decode拷贝。更早版本会把
+    bytes再次JSON编码,不可用。
+    """
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+
+# 元数据查询SQL:固定字符串,配合连接级statement cache只parse/plan一次
+_LIST_DATABASES_SQL = "SELECT datname FROM pg_database WHERE datistemplate = false ORDER BY datname"
+_LIST_TABLES_SQL = """
+    SELECT tablename
+    FROM pg_catalog.pg_tables
+    WHERE schemaname = 'public'
+    ORDER BY tablename
+"""
+_DESCRIBE_TABLE_SQL = """
+    SELECT
+        column_name,
+        data_type,
+        is_nullable,
+        column_default,
+        character_maximum_length
+    FROM information_schema.columns
+    WHERE table_schema = 'public'
+    AND table_name = $1
+    ORDER BY ordinal_position
+"""
+
+
+async def _warm_metadata_stmts(connection: asyncpg.Connection) -> None:
+    """连接池init回调:预热元数据查询的prepared statement缓存
+
+    asyncpg按查询文本缓存隐式prepared statement,在连接建立时各执行
+    一次,后续工具调用即可直接命中已prepare的语句,省去服务端的
+    parse/plan开销。
+    """
+    await connection.fetch(_LIST_DATABASES_SQL)
+    await connection.fetch(_LIST_TABLES_SQL)
+    await connection.fetch(_DESCRIBE_TABLE_SQL, '')
+
+
+# 允许的SQL命令
+_SAFE_COMMANDS = frozenset({'SELECT', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN', 'WITH'})
+
+# 数据库上下文检查:一次扫描同时捕获数据库切换和跨schema访问
+_CONTEXT_RE = re.compile(
+    r'(?P<switch>\\C\s|\bUSE\s)'
+    r'|\b(?:FROM|JOIN|INTO|UPDATE)\s+(?P<schema>[^\s\.]+)\.',
+    re.I
+)
+
+# 允许访问的schema
+_SAFE_SCHEMAS = frozenset({'public', 'pg_catalog', 'information_schema'})
+
+# SELECT语句中不允许嵌套的DML/DDL关键字
+_DANGEROUS_DML = frozenset({'INSERT', 'UPDATE', 'DELETE', 'DROP', 'ALTER', 'CREATE', 'TRUNCATE', 'COPY'})
+
+# SELECT语句中的危险构造,单次search代替多次子串扫描
+_DANGEROUS_CONSTRUCT_RE = re.compile(
+    r'(?P<outfile>INTO\s+OUTFILE)|(?P<copy>\bCOPY\s)'
+    r'|(?P<read_file>PG_READ_FILE\()|(?P<ls_dir>PG_LS_DIR\()|(?P<sysvar>@@)'
+)
+_DANGEROUS_CONSTRUCT_DESC = {
+    'outfile': 'SELECT INTO OUTFILE',
+    'copy': 'COPY命令',
+    'read_file': '文件读取函数pg_read_file',
+    'ls_dir': '目录列表函数pg_ls_dir',
+    'sysvar': '系统变量访问',
+}
+
+# 快速路径正则:识别安全命令关键字。前导空白和注释由
+# _skip_leading_comments线性跳过,正则本身不含可回溯的量词
+_FIRST_KW_RE = re.compile(
+    r'(SELECT|WITH|SHOW|DESC(?:RIBE)?|EXPLAIN)\b',
+    re.I
+)
+# 快速路径正则:一趟扫描所有危险关键字/构造
+_DANGER_RE = re.compile(
+    r'\b(INSERT|UPDATE|DELETE|DROP|ALTER|CREATE|TRUNCATE|COPY|GRANT|REVOKE'
+    r'|INTO\s+OUTFILE|PG_READ_FILE|PG_LS_DIR|UNION)\b|@@',
+    re.I
+)
+
+# 超过该长度的查询不在事件循环内做快速路径扫描,直接交给线程
+_FAST_PATH_INLINE_MAX = 8192
+
+
+def _skip_leading_comments(query: str) -> str:
+    """线性跳过前导空白与SQL注释,返回剩余文本
+
+    注释不闭合时返回空串,由调用方回退到完整解析。
+    """
+    i, n = 0, len(query)
+    while i < n:
+        char = query[i]
+        if char.isspace():
+            i += 1
+        elif query.startswith('--', i):
+            end = query.find('\n', i + 2)
+            if end == -1:
+                return ''
+            i = end + 1
+        elif query.startswith('/*', i):
+            end = query.find('*/', i + 2)
+            if end == -1:
+                return ''
+            i = end + 2
+        else:
+            break
+    return query[i:]
+
+
+def _regex_fast_path_safe(query: str) -> bool:
+    """正则快速路径:单条查询,以安全命令开头且不含危险关键字
+
+    这类查询无需构建完整的sqlparse AST,两次线性扫描即可放行。
+    """
+    return (';' not in query
+            and bool(_FIRST_KW_RE.match(_skip_leading_comments(query)))
+            and not _DANGER_RE.search(query))
+
+
+@lru_cache(maxsize=1024)
+def _check_query_safety_cached(query: str) -> tuple[bool, str]:
+    """使用AST语法树检查查询安全性,结果按查询串缓存
+
+    MCP工作负载常重复发起相同或模板化的查询,缓存可避免
+    每次重新tokenize整个SQL字符串。
+    """
+    if _regex_fast_path_safe(query):
+        return True, ""
+
+    # 慢速路径:正则发现可疑内容时,回退到完整的AST分析
+    try:
+        # 大写副本只构建一次,供各语句的危险构造扫描复用
+        query_upper = query.upper()
+
+        # 解析SQL为AST
+        parsed = sqlparse.parse(query)
+
+        if not parsed:
+            return False, "无法解析SQL查询"
+
+        # 检查每个SQL语句
+        for statement in parsed:
+            is_safe, error_msg = _check_statement_safety(statement, query_upper)
+            if not is_safe:
+                return False, error_msg
+
+        return True, ""
+
+    except Exception as e:
+        # 如果解析失败,出于安全考虑拒绝查询
+        return False, f"SQL解析失败,查询被拒绝: {str(e)}"
+
 
-class DecimalEncoder(json.JSONEncoder):
-    """自定义JSON编码器,用于处理Decimal类型"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            # 将Decimal转换为float,如果需要保持精度可以转为string
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+def _check_statement_safety(statement: sql.Statement, query_upper: str) -> tuple[bool, str]:
+    """检查单个SQL语句的安全性"""
+    # 获取语句类型(第一个非空白token)
+    first_token = None
+    for token in statement.tokens:
+        if not token.is_whitespace:
+            first_token = token
+            break
+
+    if not first_token:
+        return False, "空的SQL语句"
+
+    # 获取SQL命令关键字
+    sql_keyword = _extract_sql_keyword(first_token)
+
+    if sql_keyword not in _SAFE_COMMANDS:
+        return False, _msg('disallowed_command', keyword=sql_keyword)
+
+    # 对SELECT语句进行深度安全检查
+    if sql_keyword == 'SELECT':
+        return _check_select_safety(statement, query_upper)
+
+    return True, ""
+
+
+def _extract_sql_keyword(token) -> str:
+    """提取SQL关键字"""
+    if hasattr(token, 'ttype') and token.ttype is T.Keyword.DML:
+        return token.value.upper()
+    elif hasattr(token, 'ttype') and token.ttype is T.Keyword:
+        return token.value.upper()
+    elif hasattr(token, 'ttype') and token.ttype is T.Keyword.CTE:
+        return token.value.upper()
+    elif hasattr(token, 'tokens'):
+        # 如果是复合token,递归查找关键字
+        for sub_token in token.tokens:
+            if not sub_token.is_whitespace:
+                return _extract_sql_keyword(sub_token)
+
+    # 兜底:直接取token值
+    return str(token).upper().strip()
+
+
+def _check_select_safety(statement: sql.Statement, query_upper: str) -> tuple[bool, str]:
+    """检查SELECT语句的安全性
+
+    直接扫描调用方传入的大写查询串,避免str(statement)把token树
+    重新序列化成一份新字符串。
+    """
+    # 检查危险的SELECT操作,一次search覆盖所有构造
+    match = _DANGEROUS_CONSTRUCT_RE.search(query_upper)
+    if match:
+        description = _DANGEROUS_CONSTRUCT_DESC[match.lastgroup]
+        return False, _msg('dangerous_construct', description=description)
+
+    # 检查UNION操作(可能用于注入)
+    if 'UNION' in query_upper:
+        # 检查UNION后是否有其他表(可能是注入尝试)
+        # 这里采用保守策略:所有跨表UNION都被视为潜在危险
+        return False, _msg('union_detected')
+
+    # 使用AST检查嵌套的危险操作
+    return _check_nested_dangerous_operations(statement)
+
+
+def _check_nested_dangerous_operations(statement: sql.Statement) -> tuple[bool, str]:
+    """检查嵌套的危险操作,如UNION注入
+
+    使用flatten()迭代遍历叶子token,避免逐token的Python递归调用开销。
+    """
+    for token in statement.flatten():
+        if token.ttype in (T.Keyword.DML, T.Keyword.DDL):
+            keyword = token.normalized.upper()
+            if keyword in _DANGEROUS_DML:
+                return False, _msg('nested_dml', keyword=keyword)
+
+    return True, ""
 
 
 class PostgreSQLHandler:
     """PostgreSQL数据库处理器,提供安全的数据库操作"""
 
+    # 进程级连接池,所有实例共享,首次使用时惰性创建
+    _pool: Optional[asyncpg.Pool] = None
+    _pool_lock = asyncio.Lock()
+
+    # 危险操作的关键词列表
+    dangerous_keywords = frozenset({
+        'DROP', 'DELETE', 'UPDATE', 'INSERT', 'ALTER', 'CREATE', 'TRUNCATE',
+        'REPLACE', 'GRANT', 'REVOKE', 'FLUSH', 'RESET', 'START', 'STOP',
+        'KILL', 'CHANGE', 'SET', 'LOAD', 'LOCK', 'UNLOCK', 'COPY'
+    })
+
     def __init__(self):
-        # 检测系统语言环境
-        self.is_chinese = self._detect_chinese_locale()
+        # 语言环境在_locale模块导入时已检测,直接复用
+        self.is_chinese = IS_CHINESE
         pg_host = os.getenv('PG_HOST')
         if not pg_host:
             raise ValueError("PG_HOST环境变量未设置")
@@ -51,224 +352,91 @@ class PostgreSQLHandler:
 
         self.allow_dangerous_operations = os.getenv('PG_ALLOW_DANGEROUS', 'false').lower() == 'true'
 
-        # 危险操作的关键词列表
-        self.dangerous_keywords = [
-            'DROP', 'DELETE', 'UPDATE', 'INSERT', 'ALTER', 'CREATE', 'TRUNCATE',
-            'REPLACE', 'GRANT', 'REVOKE', 'FLUSH', 'RESET', 'START', 'STOP',
-            'KILL', 'CHANGE', 'SET', 'LOAD', 'LOCK', 'UNLOCK', 'COPY'
-        ]
-
-        self.logger = logging.getLogger(__name__)
-
-    def _detect_chinese_locale(self) -> bool:
-        """检测是否为中文语言环境"""
-        try:
-            # 尝试获取系统语言环境
-            lang = locale.getdefaultlocale()[0]
-            if lang and ('zh' in lang.lower() or 'chinese' in lang.lower()):
-                return True
-
-            # 检查环境变量
-            for env_var in ['LANG', 'LANGUAGE', 'LC_ALL', 'LC_MESSAGES']:
-                lang_env = os.getenv(env_var, '')
-                if lang_env and ('zh' in lang_env.lower() or 'chinese' in lang_env.lower()):
-                    return True
-
-            return False
-        except Exception:
-            # 如果检测失败,默认使用英文
-            return False
-
     def _get_message(self, zh_msg: str, en_msg: str) -> str:
         """根据语言环境返回对应消息"""
-        return zh_msg if self.is_chinese else en_msg
-
-    async def get_connection(self) -> asyncpg.Connection:
-        """获取数据库连接"""
-        try:
-            connection = await asyncpg.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database
-            )
-            return connection
-        except Exception as e:
-            self.logger.error(f"连接数据库失败: {e}")
-            raise Exception(f"无法连接到数据库: {str(e)}")
-
-    def is_query_safe(self, query: str) -> tuple[bool, str]:
+        return _locale_msg(zh_msg, en_msg)
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        """获取进程级连接池,首次调用时创建"""
+        if PostgreSQLHandler._pool is None:
+            async with PostgreSQLHandler._pool_lock:
+                # 双重检查,避免并发重复创建
+                if PostgreSQLHandler._pool is None:
+                    try:
+                        PostgreSQLHandler._pool = await asyncpg.create_pool(
+                            host=self.host,
+                            port=self.port,
+                            user=self.user,
+                            password=self.password,
+                            database=self.database,
+                            min_size=int(os.getenv('PG_POOL_MIN', '1')),
+                            max_size=int(os.getenv('PG_POOL_MAX', '10')),
+                            statement_cache_size=1024,
+                            init=_warm_metadata_stmts
+                        )
+                    except Exception as e:
+                        _log.error(f"创建连接池失败: {e}")
+                        raise Exception(f"无法连接到数据库: {str(e)}")
+        return PostgreSQLHandler._pool
+
+    @classmethod
+    async def close_pool(cls) -> None:
+        """关闭连接池,服务器关闭时调用"""
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+
+    async def is_query_safe(self, query: str) -> tuple[bool, str]:
         """使用AST语法树检查查询是否安全"""
-        # 如果允许危险操作,直接返回安全
+        # 如果允许危险操作,直接返回安全(放在缓存之前,避免污染缓存键)
         if self.allow_dangerous_operations:
             return True, ""
 
-        try:
-            # 解析SQL为AST
-            parsed = sqlparse.parse(query)
-
-            if not parsed:
-                return False, "无法解析SQL查询"
+        # 常规长度的查询在事件循环内走快速路径;扫描虽为线性,
+        # 超长输入仍会占用事件循环,设上限兜底
+        if len(query) <= _FAST_PATH_INLINE_MAX and _regex_fast_path_safe(query):
+            return True, ""
 
-            # 检查每个SQL语句
-            for statement in parsed:
-                is_safe, error_msg = self._check_statement_safety(statement)
-                if not is_safe:
-                    return False, error_msg
+        # sqlparse为纯Python实现,大查询的解析可达数十毫秒,放到线程
+        # 执行以免阻塞事件循环;结果仍由lru_cache缓存
+        return await asyncio.to_thread(_check_query_safety_cached, query)
 
-            return True, ""
+    def validate_database_context(self, query: str) -> tuple[bool, str]:
+        """验证查询是否在允许的数据库上下文中执行
 
-        except Exception as e:
-            # 如果解析失败,出于安全考虑拒绝查询
-            return False, f"SQL解析失败,查询被拒绝: {str(e)}"
-
-    def _check_statement_safety(self, statement: sql.Statement) -> tuple[bool, str]:
-        """检查单个SQL语句的安全性"""
-        # 获取语句类型(第一个非空白token)
-        first_token = None
-        for token in statement.tokens:
-            if not token.is_whitespace:
-                first_token = token
-                break
-
-        if not first_token:
-            return False, "空的SQL语句"
-
-        # 获取SQL命令关键字
-        sql_keyword = self._extract_sql_keyword(first_token)
-
-        # 定义允许的SQL命令
-        safe_commands = {'SELECT', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN', 'WITH'}
-
-        if sql_keyword not in safe_commands:
-            error_msg = self._get_message(
-                f"不允许的SQL命令: {sql_keyword}。仅允许SELECT、SHOW、DESCRIBE、EXPLAIN查询,除非在环境变量中启用危险操作。",
-                f"Disallowed SQL command: {sql_keyword}. Only SELECT, SHOW, DESCRIBE, EXPLAIN queries are allowed unless dangerous operations are enabled via environment variable."
-            )
-            return False, error_msg
+        数据库切换和跨schema访问由同一个正则单次扫描检出,
+        发现第一个违规即返回。
+        """
+        for match in _CONTEXT_RE.finditer(query):
+            # 检查是否尝试切换数据库
+            if match.lastgroup == 'switch':
+                return False, f"不允许切换数据库。只能在配置的数据库 '{self.database}' 中操作。"
 
-        # 对SELECT语句进行深度安全检查
-        if sql_keyword == 'SELECT':
-            return self._check_select_safety(statement)
+            # PostgreSQL使用schema.table格式,这里只警告访问非public schema
+            schema = match.group('schema')
+            if schema.lower() not in _SAFE_SCHEMAS:
+                return False, f"不允许访问其他schema '{schema}'。只能在配置的数据库的public schema中操作。"
 
         return True, ""
 
-    def _extract_sql_keyword(self, token) -> str:
-        """提取SQL关键字"""
-        if hasattr(token, 'ttype') and token.ttype is T.Keyword.DML:
-            return token.value.upper()
-        elif hasattr(token, 'ttype') and token.ttype is T.Keyword:
-            return token.value.upper()
-        elif hasattr(token, 'ttype') and token.ttype is T.Keyword.CTE:
-            return token.value.upper()
-        elif hasattr(token, 'tokens'):
-            # 如果是复合token,递归查找关键字
-            for sub_token in token.tokens:
-                if not sub_token.is_whitespace:
-                    return self._extract_sql_keyword(sub_token)
-
-        # 兜底:直接取token值
-        return str(token).upper().strip()
-
-    def _check_select_safety(self, statement: sql.Statement) -> tuple[bool, str]:
-        """检查SELECT语句的安全性"""
-        statement_str = str(statement).upper()
-
-        # 检查危险的SELECT操作
-        dangerous_constructs = [
-            ('INTO OUTFILE', 'SELECT INTO OUTFILE'),
-            ('COPY ', 'COPY命令'),
-            ('PG_READ_FILE(', '文件读取函数pg_read_file'),
-            ('PG_LS_DIR(', '目录列表函数pg_ls_dir'),
-            ('@@', '系统变量访问'),
-        ]
-
-        for construct, description in dangerous_constructs:
-            if construct in statement_str:
-                error_msg = self._get_message(
-                    f"检测到危险的{description}操作,查询被拒绝",
-                    f"Detected dangerous {description} operation, query rejected"
-                )
-                return False, error_msg
+    async def validate_query(self, query: str) -> tuple[bool, str]:
+        """统一的查询门控:一次调用完成安全检查与数据库上下文检查
 
-        # 检查UNION操作(可能用于注入)
-        if 'UNION' in statement_str:
-            # 检查UNION后是否有其他表(可能是注入尝试)
-            # 这里采用保守策略:所有跨表UNION都被视为潜在危险
-            error_msg = self._get_message(
-                "检测到UNION操作,可能存在安全风险,查询被拒绝",
-                "Detected UNION operation, potential security risk, query rejected"
-            )
+        廉价的上下文正则扫描先行,违规查询不再支付sqlparse解析的
+        成本;两项检查合并为单一入口,调用方只需门控一次。
+        """
+        is_valid_context, error_msg = self.validate_database_context(query)
+        if not is_valid_context:
             return False, error_msg
 
-        # 使用AST检查嵌套的危险操作
-        return self._check_nested_dangerous_operations(statement)
-
-    def _check_nested_dangerous_operations(self, statement: sql.Statement) -> tuple[bool, str]:
-        """递归检查嵌套的危险操作,如UNION注入"""
-        def check_token_recursively(token):
-            # 检查当前token
-            if hasattr(token, 'ttype'):
-                if token.ttype is T.Keyword.DML:
-                    keyword = token.value.upper()
-                    dangerous_dml = {'INSERT', 'UPDATE', 'DELETE', 'DROP', 'ALTER', 'CREATE', 'TRUNCATE', 'COPY'}
-                    if keyword in dangerous_dml:
-                        error_msg = self._get_message(
-                            f"在SELECT语句中检测到危险的{keyword}操作",
-                            f"Detected dangerous {keyword} operation in SELECT statement"
-                        )
-                        return False, error_msg
-
-            # 递归检查子token
-            if hasattr(token, 'tokens'):
-                for sub_token in token.tokens:
-                    is_safe, error_msg = check_token_recursively(sub_token)
-                    if not is_safe:
-                        return False, error_msg
-
-            return True, ""
-
-        # 检查语句中的所有token
-        for token in statement.tokens:
-            is_safe, error_msg = check_token_recursively(token)
-            if not is_safe:
-                return False, error_msg
-
-        return True, ""
-
-    def validate_database_context(self, query: str) -> tuple[bool, str]:
-        """验证查询是否在允许的数据库上下文中执行"""
-        query_upper = query.strip().upper()
-
-        # 检查是否尝试切换数据库
-        if '\\C ' in query_upper or 'USE ' in query_upper:
-            return False, f"不允许切换数据库。只能在配置的数据库 '{self.database}' 中操作。"
-
-        # 检查是否尝试访问其他数据库
-        # 这个检查比较复杂,这里做简单的模式匹配
-        database_patterns = [
-            r'\b(?:FROM|JOIN|INTO|UPDATE)\s+([^\s\.]+)\.', # 表名前有数据库名
-        ]
-
-        for pattern in database_patterns:
-            matches = re.findall(pattern, query, re.IGNORECASE)
-            for match in matches:
-                # PostgreSQL使用schema.table格式,这里只警告访问非public schema
-                if match.lower() not in ['public', 'pg_catalog', 'information_schema']:
-                    return False, f"不允许访问其他schema '{match}'。只能在配置的数据库的public schema中操作。"
-
-        return True, ""
+        return await self.is_query_safe(query)
 
     async def list_databases(self) -> List[str]:
         """列出所有数据库(仅显示当前用户有权限的)"""
-        connection = None
         try:
-            connection = await self.get_connection()
-            # PostgreSQL查询所有数据库
-            rows = await connection.fetch(
-                "SELECT datname FROM pg_database WHERE datistemplate = false ORDER BY datname"
-            )
+            async with (await self._get_pool()).acquire() as connection:
+                # PostgreSQL查询所有数据库
+                rows = await connection.fetch(_LIST_DATABASES_SQL)
             db_list = [row['datname'] for row in rows]
             # 突出显示当前配置的数据库
             result = []
@@ -279,84 +447,57 @@ class PostgreSQLHandler:
                     result.append(db)
             return result
         except Exception as e:
-            self.logger.error(f"列出数据库失败: {e}")
+            _log.error(f"列出数据库失败: {e}")
             raise Exception(f"获取数据库列表失败: {str(e)}")
-        finally:
-            if connection:
-                await connection.close()
 
     async def list_tables(self) -> List[str]:
         """列出当前数据库中的所有表"""
-        connection = None
         try:
-            connection = await self.get_connection()
-            # PostgreSQL查询当前数据库的所有表
-            rows = await connection.fetch("""
-                SELECT tablename
-                FROM pg_catalog.pg_tables
-                WHERE schemaname = 'public'
-                ORDER BY tablename
-            """)
+            async with (await self._get_pool()).acquire() as connection:
+                # PostgreSQL查询当前数据库的所有表
+                rows = await connection.fetch(_LIST_TABLES_SQL)
             return [row['tablename'] for row in rows]
         except Exception as e:
-            self.logger.error(f"列出表失败: {e}")
+            _log.error(f"列出表失败: {e}")
             raise Exception(f"获取表列表失败: {str(e)}")
-        finally:
-            if connection:
-                await connection.close()
 
-    async def describe_table(self, table_name: str) -> str:
+    async def describe_table(self, table_name: str) -> bytes:
         """描述表结构"""
-        connection = None
         try:
-            # 验证表名(防止SQL注入)
-            if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', table_name):
+            # 验证表名(防止SQL注入)。典型表名很短,纯Python字符检查
+            # 比正则引擎的启动成本更低
+            if (not table_name
+                    or not table_name.isascii()
+                    or not (table_name[0].isalpha() or table_name[0] == '_')
+                    or not all(c.isalnum() or c == '_' for c in table_name)):
                 raise Exception("无效的表名格式")
 
-            connection = await self.get_connection()
-            # PostgreSQL查询表结构
-            rows = await connection.fetch("""
-                SELECT
-                    column_name,
-                    data_type,
-                    is_nullable,
-                    column_default,
-                    character_maximum_length
-                FROM information_schema.columns
-                WHERE table_schema = 'public'
-                AND table_name = $1
-                ORDER BY ordinal_position
-            """, table_name)
+            async with (await self._get_pool()).acquire() as connection:
+                # PostgreSQL查询表结构
+                rows = await connection.fetch(_DESCRIBE_TABLE_SQL, table_name)
 
             if not rows:
-                error_msg = self._get_message(
-                    f"表 '{table_name}' 不存在或无权限访问",
-                    f"Table '{table_name}' does not exist or access denied"
-                )
+                error_msg = _msg('table_missing', table=table_name)
                 error_result = {
                     "status": "error",
                     "message": error_msg
                 }
-                return json.dumps(error_result, ensure_ascii=False, cls=DecimalEncoder)
+                return _dumps(error_result)
 
             # 构建结构化的JSON响应
+            # Record按位置解包(列顺序与_DESCRIBE_TABLE_SQL一致),避免逐列的字符串键查找
             column_info = []
-            for row in rows:
-                col_type = row['data_type']
-                if row['character_maximum_length']:
-                    col_type = f"{col_type}({row['character_maximum_length']})"
+            for column_name, data_type, is_nullable, column_default, char_max_len in rows:
+                col_type = f"{data_type}({char_max_len})" if char_max_len else data_type
 
                 column_info.append({
-                    "field": row['column_name'],
+                    "field": column_name,
                     "type": col_type,
-                    "null": row['is_nullable'],
-                    "default": row['column_default']
+                    "null": is_nullable,
+                    "default": column_default
                 })
 
-            success_msg = self._get_message(
-                f"表 '{table_name}' 包含 {len(rows)} 个字段",
-                f"Table '{table_name}' contains {len(rows)} field(s)"
-            )
+            success_msg = _msg('table_described', table=table_name, n=len(rows))
             result = {
                 "status": "success",
                 "message": success_msg,
@@ -364,80 +505,53 @@ class PostgreSQLHandler:
                 "columns": column_info
             }
 
-            return json.dumps(result, ensure_ascii=False, cls=DecimalEncoder)
+            return _dumps(result)
         except Exception as e:
-            self.logger.error(f"描述表结构失败: {e}")
+            _log.error(f"描述表结构失败: {e}")
             raise Exception(f"获取表 '{table_name}' 结构失败: {str(e)}")
-        finally:
-            if connection:
-                await connection.close()
 
-    async def execute_query(self, query: str) -> str:
+    async def execute_query(self, query: str) -> Union[str, bytes]:
         """执行SQL查询"""
-        connection = None
         try:
-            # 安全性检查
-            is_safe, safety_msg = self.is_query_safe(query)
-            if not is_safe:
-                rejected_msg = self._get_message("查询被拒绝", "Query rejected")
-                return f"{rejected_msg}: {safety_msg}"
-
-            # 数据库上下文检查
-            is_valid_context, context_msg = self.validate_database_context(query)
-            if not is_valid_context:
-                rejected_msg = self._get_message("查询被拒绝", "Query rejected")
-                return f"{rejected_msg}: {context_msg}"
+            # strip/upper只做一次,安全检查、上下文检查与类型分发共享
+            query = query.strip()
+            query_upper = query.upper()
 
-            connection = await self.get_connection()
+            # 安全检查与数据库上下文检查合并为一次门控
+            is_valid, gate_msg = await self.validate_query(query)
+            if not is_valid:
+                return f"{_msg('query_rejected')}: {gate_msg}"
 
             # 判断查询类型
-            query_upper = query.strip().upper()
             if query_upper.startswith(('SELECT', 'WITH', 'SHOW', 'EXPLAIN')):
                 # SELECT查询,获取结果
-                rows = await connection.fetch(query)
+                async with (await self._get_pool()).acquire() as connection:
+                    rows = await connection.fetch(query)
 
                 if not rows:
-                    no_results_msg = self._get_message("查询执行成功,但没有返回结果", "Query executed successfully, but no results returned")
-                    return json.dumps({"status": "success", "message": no_results_msg, "data": []}, ensure_ascii=False, cls=DecimalEncoder)
+                    return _dumps({"status": "success", "message": _msg('query_no_results'), "data": []})
 
                 # 获取列名
                 columns = list(rows[0].keys()) if rows else []
 
                 # 转换为字典列表格式
-                data = []
-                for row in rows:
-                    row_dict = {}
-                    for col_name in columns:
-                        value = row[col_name]
-                        # 处理特殊类型
-                        if value is None:
-                            row_dict[col_name] = None
-                        elif isinstance(value, Decimal):
-                            row_dict[col_name] = float(value)
-                        elif hasattr(value, 'isoformat'):  # datetime对象
-                            row_dict[col_name] = value.isoformat()
-                        else:
-                            row_dict[col_name] = value
-                    data.append(row_dict)
-
-                success_msg = self._get_message(
-                    f"查询执行成功,返回 {len(data)} 行结果",
-                    f"Query executed successfully, returned {len(data)} row(s)"
-                )
-                return json.dumps({
+                # dict(Record)在asyncpg内部以C实现,逐行转换无Python级内层循环
+                # orjson原生支持datetime序列化,Decimal由_default回调处理
+                data = [dict(row) for row in rows]
+
+                success_msg = _msg('query_ok', n=len(data))
+                return _dumps({
                     "status": "success",
                     "message": success_msg,
                     "columns": columns,
                     "data": data
-                }, ensure_ascii=False, cls=DecimalEncoder)
+                })
             else:
                 # 对于非SELECT查询(如果允许的话)
-                result = await connection.execute(query)
+                async with (await self._get_pool()).acquire() as connection:
+                    result = await connection.execute(query)
                 return f"查询执行成功,影响了 {result} 行。"
 
         except Exception as e:
-            self.logger.error(f"执行查询失败: {e}")
+            _log.error(f"执行查询失败: {e}")
             return f"查询执行失败: {str(e)}"
-        finally:
-            if connection:
-                await connection.close()